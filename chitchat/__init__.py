@@ -3,5 +3,4 @@ from . import structures
 from . import utils
 
 from .client import Client
-from .commands import *
-from .decorator import on
\ No newline at end of file
+from .commands import *
\ No newline at end of file
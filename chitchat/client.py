@@ -1,19 +1,45 @@
+import asyncio
 import functools
+import inspect
+import logging
 
 from . import connection
 from . import constants
 from . import structures
 from . import utils
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _await(awaitable):
+    return await awaitable
         
         
 class Client(connection.AsynchronousConnection):
     
+    __slots__ = ('encoding', 'plugins', '_dispatch', '_everything', '_create_task',
+                 '_tasks')
     
     def __init__(self, *args, encoding='UTF-8', **kwargs):
         super().__init__(*args, **kwargs)
         
         self.encoding = encoding
-        self.plugins = structures.CaseInsensitiveDefaultDict(set)
+        # upper-cased command -> set of plugins
+        self.plugins = {}
+        
+        # ASCII-encoded command -> tuples of plugin functions, merged with ALL plugins at
+        # registration; keyed by bytes so incoming commands never have to be decoded
+        self._dispatch = {}
+        # functions of ALL plugins, for commands without plugins of their own
+        self._everything = None
+        
+        # the loop's bound create_task, so scheduling each plugin task doesn't go through
+        # the loop property and a method lookup; bound when first needed, as the loop may
+        # not be known yet
+        self._create_task = None
+        # running plugin tasks, the loop itself only keeps weak references to them
+        self._tasks = set()
     
     
     def register(self, object=None):
@@ -25,14 +51,50 @@ class Client(connection.AsynchronousConnection):
         returns:
             `None`
         """
+        commands = set()
+        
         for plugin in utils.find_plugins(object):
-            self.plugins[plugin.command].add(plugin)
+            # Plugin.command is already upper-cased and interned
+            self.plugins.setdefault(plugin.command, set()).add(plugin)
+            commands.add(plugin.command)
+            
+        self._build_dispatch(commands)
+            
+            
+    def _build_dispatch(self, commands):
+        """Precompute the plugins triggered by each of `commands`, including ALL plugins.
+        
+        Each command maps to a pair of tuples: regular functions, which are called
+        directly, and coroutine functions, which are scheduled as tasks. Functions are
+        pulled out of their plugins here so triggering doesn't have to go through
+        `Plugin` on every message, and tuples are cheaper to iterate than sets.
+        
+        Only the entries for `commands` are rebuilt, unless ALL is among them, as ALL
+        plugins are merged into every entry.
+        
+        Entries are keyed by the command encoded as ASCII, which IRC commands are, rather
+        than with the client's encoding, which may change later or not be ASCII-based.
+        """
+        if constants.ALL in commands:
+            commands = self.plugins.keys()
+        
+        everything = self.plugins.get(constants.ALL, set())
+        dispatch = self._dispatch
+        
+        for command in commands:
+            plugins = self.plugins[command] | everything
+            blocking = tuple(plugin.func for plugin in plugins if not plugin.asynchronous)
+            asynchronous = tuple(plugin.func for plugin in plugins if plugin.asynchronous)
+            dispatch[command.encode('ascii')] = (blocking, asynchronous)
+            
+        self._everything = dispatch.get(constants.ALL.encode('ascii'))
             
             
     def on(self, command, func=None, **kwargs):
         
         if func is None:
-            return functools.partialmethod(command, **kwargs)
+            # used as a decorator, register once the function is passed in
+            return functools.partial(self.on, command, **kwargs)
         
         plugin = structures.Plugin(func, command, **kwargs)
         self.register(plugin)
@@ -40,20 +102,158 @@ class Client(connection.AsynchronousConnection):
         return plugin
     
     
+    async def send(self, *lines):
+        """
+        Send one or more commands to the server.
+        
+        All lines are handed to the transport in one call and drained once, so multi-line
+        replies (e.g., `identify`) cost a single write rather than one per line.
+        
+        args:
+            lines: str commands, e.g., as built by `chitchat.commands`, which are encoded
+                   with the client's encoding; bytes are sent as is, without encoding
+                  
+        returns:
+            `None`
+        """
+        encoding = self.encoding
+        
+        await self.writelines([line.encode(encoding) if isinstance(line, str) else line
+                               for line in lines])
+    
+    
+    async def send_str(self, *lines):
+        """
+        Same as `send`, but all `lines` must be str, which saves checking each one.
+        """
+        encoding = self.encoding
+        
+        await self.writelines([line.encode(encoding) for line in lines])
+    
+    
+    async def send_bytes(self, *lines):
+        """
+        Same as `send`, but all `lines` must be already encoded bytes, which are handed
+        to the transport without being checked or copied.
+        """
+        await self.writelines(lines)
+    
+    
     def handle_incoming(self, data):
         """Parse `data` and route to the proper callbacks."""
-        # Message constructor decodes data into a regular str
+        # same as Message.command, but without building a message nobody may want, and
+        # left undecoded as dispatch is keyed by ASCII bytes
+        command = utils.ircpeek(data).upper()
+        
+        # most lines go unhandled, so check before doing any more work
+        if self._everything is None and command not in self._dispatch:
+            return
+        
+        # decoding and parsing are deferred until a plugin asks for them
         message = structures.Message(data, encoding=self.encoding)
-        self.trigger(message.command, message)
+        # command is already upper-cased and encoded, skip the normalization in trigger
+        self._trigger(command, message)
 
     
     def trigger(self, command, *args, **kwargs):
-        """Triggers plugins associated with `command` to be run asynchronously."""
+        """Triggers plugins associated with `command`.
+        
+        Plugins wrapping regular functions are called immediately, plugins wrapping
+        coroutine functions are scheduled to be run asynchronously.
+        
+        `command` must be ASCII, as all IRC commands are, see `_build_dispatch`.
+        
+        Regular functions may be triggered without a running event loop, in which case
+        their exceptions are logged; coroutine functions need one to be scheduled on.
+        """
+        self._trigger(command.upper().encode('ascii'), *args, **kwargs)
+        
         
-        funcs = self.plugins[command] | self.plugins[constants.ALL]
+    def _trigger(self, command, *args, **kwargs):
+        """Same as `trigger`, but `command` must already be upper-cased ASCII bytes."""
+        
+        # commands without plugins of their own still trigger ALL plugins
+        buckets = self._dispatch.get(command, self._everything)
+        
+        # most commands have nobody listening, skip straight out
+        if buckets is None:
+            return
+        
+        blocking, asynchronous = buckets
+        
+        for func in blocking:
+            try:
+                result = func(self, *args, **kwargs)
+            
+            except Exception as e:
+                self._report(func, e)
+                
+            else:
+                # a regular function may still hand back something to await, e.g.,
+                # `lambda client, message: client.send(...)`
+                if inspect.isawaitable(result):
+                    self._schedule(result)
+        
+        for func in asynchronous:
+            self._schedule(func(self, *args, **kwargs))
+            
+            
+    def _report(self, func, exception):
+        """Report an exception raised by a regular plugin function."""
+        message = 'Exception in plugin function {!r}'.format(func)
+        loop = self._loop
         
-        run = self.loop.create_task
+        if loop is None:
+            try:
+                loop = asyncio.get_running_loop()
+            
+            except RuntimeError:
+                # triggered outside of any event loop, e.g., by calling trigger directly,
+                # so don't hide the plugin's exception behind the lack of a loop
+                logger.error(message, exc_info=exception)
+                return
+        
+        # report it the same way an exception in a task would be reported
+        loop.call_exception_handler({'message': message, 'exception': exception})
+        
+        
+    def _schedule(self, awaitable):
+        """Run `awaitable` as a task, tracked until it's done."""
+        run = self._create_task
+        
+        if run is None:
+            run = self._create_task = self.loop.create_task
+        
+        if not inspect.iscoroutine(awaitable):
+            # e.g., a future returned by a regular function, create_task needs a coroutine
+            awaitable = _await(awaitable)
+        
+        task = run(awaitable)
+        
+        # an eager task may have already finished
+        if not task.done():
+            tasks = self._tasks
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    
+    
+    async def disconnect(self):
+        """
+        Cancel any plugins still running and close the connection with the host.
+        
+        Only tasks started by this client's plugins are cancelled, other tasks running
+        on the loop are left alone.
+        """
+        # a plugin may be the one disconnecting, don't cancel it out from under itself
+        tasks = self._tasks - {asyncio.current_task(self.loop)}
+        
+        for task in tasks:
+            task.cancel()
+        
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+        await super().disconnect()
         
-        for func in funcs:
-            coro = func(self, *args, **kwargs)
-            run(coro)
\ No newline at end of file
+        # the next run may be on another loop, e.g., run_blocking makes one for each run
+        self._create_task = None
@@ -1,8 +1,35 @@
-import asyncio
-import itertools
+import functools
 
 from . import constants, utils
 
+# the most frequently sent commands have a fixed shape, so rather than going through
+# ircjoin they fill in a template built once at import
+_JOIN = constants.JOIN + ' %s' + constants.CRLF
+_PART = constants.PART + ' %s' + constants.CRLF
+_PART_MESSAGE = constants.PART + ' %s :%s' + constants.CRLF
+_PRIVMSG = constants.PRIVMSG + ' %s :%s' + constants.CRLF
+_NOTICE = constants.NOTICE + ' %s :%s' + constants.CRLF
+_PING = constants.PING + ' %s' + constants.CRLF
+_PONG = constants.PONG + ' %s' + constants.CRLF
+
+# builders whose shape is just as fixed, but which are called less often
+_PASS = constants.PASS + ' %s' + constants.CRLF
+_NICK = constants.NICK + ' %s' + constants.CRLF
+_QUIT = constants.QUIT + ' :%s' + constants.CRLF
+_INVITE = constants.INVITE + ' %s %s' + constants.CRLF
+_KILL = constants.KILL + ' %s :%s' + constants.CRLF
+_ERROR = constants.ERROR + ' :%s' + constants.CRLF
+_AWAY = constants.AWAY + ' :%s' + constants.CRLF
+_WALLOPS = constants.WALLOPS + ' :%s' + constants.CRLF
+_SETNAME = constants.SETNAME + ' :%s' + constants.CRLF
+_USERIP = constants.USERIP + ' %s' + constants.CRLF
+
+# builders that take no or only a few, often repeated, arguments (e.g., PONG to the same
+# server every few minutes) are cached with @functools.lru_cache, so arguments to them
+# must be hashable. builders taking free text (e.g., PRIVMSG, QUIT, AWAY) or one-off
+# commands aren't cached, as repeats are rare and the cache would only hold on to the
+# text; neither is PASS, so passwords aren't kept around in memory
+
 # RFC-defined commands in order of definition in RFC 2812
 
 
@@ -19,9 +46,10 @@ def pass_(password):
         An unencoded string representing the PASS command.
     """
     
-    return utils.ircjoin(constants.PASS, password)
+    return _PASS % (password, )
 
 
+@functools.lru_cache(maxsize=128)
 def nick(nickname):
     """
     Builds a NICK command used to give or change a user's nickname.
@@ -33,7 +61,7 @@ def nick(nickname):
         An unencoded string representing the NICK command.
     """
     
-    return utils.ircjoin(constants.NICK, nickname)
+    return _NICK % (nickname, )
 
 
 def user(username, realname=None, mode=0, unused='*'):
@@ -123,7 +151,10 @@ def quit(message=None):
         An unencoded string representing the QUIT command.
     """
     
-    return utils.ircjoin(constants.QUIT, spaced=message)
+    if not message:
+        return utils.ircjoin(constants.QUIT)
+    
+    return _QUIT % (message, )
 
 
 def squit(server, message):
@@ -157,16 +188,27 @@ def join(*channels, keys=None):
     
     if keys is None:
         
-        return utils.ircjoin(constants.JOIN, ','.join(channels))
+        return _JOIN % ','.join(channels)
+    
+    keys = tuple(keys)
+    padding = len(channels) - len(keys)
     
-    channels, keys = zip(*itertools.zip_longest(channels, keys, fillvalue=''))
+    # pad the shorter of the two with empty entries so channels and keys still line up
+    if padding > 0:
+        keys += ('', ) * padding
+    
+    elif padding < 0:
+        channels += ('', ) * -padding
 
     return utils.ircjoin(constants.JOIN, ','.join(channels), ','.join(keys))
 
 
 def part(*channels, message=None):
     
-    return utils.ircjoin(constants.PART, ','.join(channels), spaced=message)
+    if not message:
+        return _PART % ','.join(channels)
+    
+    return _PART_MESSAGE % (','.join(channels), message)
 
 
 def topic(channel, topic=None):
@@ -186,20 +228,24 @@ def list(*channels, server=None):
 
 def invite(nickname, channel):
     
-    return utils.ircjoin(constants.INVITE, nickname, channel)
+    return _INVITE % (nickname, channel)
 
 
 def kick(channel, *nicknames, message=None):
     
-    repeater = itertools.repeat(channel, len(nicknames))
-    channels = ','.join(repeater)
+    # one channel per nickname, repeating a list is cheaper than going through an iterator
+    channels = ','.join([channel] * len(nicknames))
     
     return utils.ircjoin(constants.KICK, channels, ','.join(nicknames), spaced=message)
 
 
 def privmsg(target, message):
     
-    return utils.ircjoin(constants.PRIVMSG, target, spaced=message)
+    # an empty message is left off entirely, same as ircjoin would
+    if not message:
+        return utils.ircjoin(constants.PRIVMSG, target)
+    
+    return _PRIVMSG % (target, message)
 
 
 # name shortened for convenience
@@ -208,9 +254,13 @@ msg = privmsg
 
 def notice(target, message):
     
-    return utils.ircjoin(constants.NOTICE, target, spaced=message)
+    if not message:
+        return utils.ircjoin(constants.NOTICE, target)
+    
+    return _NOTICE % (target, message)
 
 
+@functools.lru_cache(maxsize=128)
 def motd(server=None):
     
     if server is None:
@@ -227,6 +277,7 @@ def lusers(mask='', server=None):
     return utils.ircjoin(constants.LUSERS, mask, server)
 
 
+@functools.lru_cache(maxsize=128)
 def version(server=None):
     
     if server is None:
@@ -251,6 +302,7 @@ def links(mask='', server=None):
     return utils.ircjoin(constants.LINKS, mask, server)
 
 
+@functools.lru_cache(maxsize=128)
 def time(server=None):
     
     if server is None:
@@ -267,6 +319,7 @@ def connect(server, port, remote=None):
     return utils.ircjoin(constants.CONNECT, server, port, remote)
 
 
+@functools.lru_cache(maxsize=128)
 def trace(server=None):
     
     if server is None:
@@ -275,6 +328,7 @@ def trace(server=None):
     return utils.ircjoin(constants.TRACE, server)
 
 
+@functools.lru_cache(maxsize=128)
 def admin(server=None):
     
     if server is None:
@@ -283,6 +337,7 @@ def admin(server=None):
     return utils.ircjoin(constants.ADMIN, server)
 
 
+@functools.lru_cache(maxsize=128)
 def info(server=None):
     
     if server is None:
@@ -339,27 +394,39 @@ def whowas(*nicknames, count=None, server=None):
 
 def kill(nickname, message):
     
-    return utils.ircjoin(constants.KILL, nickname, spaced=message)
+    if not message:
+        return utils.ircjoin(constants.KILL, nickname)
+    
+    return _KILL % (nickname, message)
 
 
+@functools.lru_cache(maxsize=128)
 def ping(server):
     
-    return utils.ircjoin(constants.PING, server)
+    return _PING % (server, )
 
 
+@functools.lru_cache(maxsize=128)
 def pong(server):
     
-    return utils.ircjoin(constants.PONG, server)
+    return _PONG % (server, )
 
 
 def error(message):
     
-    return utils.ircjoin(constants.ERROR, spaced=message)
+    if not message:
+        return utils.ircjoin(constants.ERROR)
+    
+    return _ERROR % (message, )
 
 
 def away(message=None):
     
-    return utils.ircjoin(constants.AWAY, spaced=message)
+    # no message marks the user as no longer away
+    if not message:
+        return utils.ircjoin(constants.AWAY)
+    
+    return _AWAY % (message, )
 
 
 def rehash():
@@ -400,7 +467,10 @@ def users(server=None):
 
 def wallops(message):
     
-    return utils.ircjoin(constants.WALLOPS, spaced=message)
+    if not message:
+        return utils.ircjoin(constants.WALLOPS)
+    
+    return _WALLOPS % (message, )
 
 
 def userhost(*nicknames):
@@ -416,6 +486,14 @@ def ison(*nicknames):
 # Non-RFC-defined commands in alphabetical order
 
 
+def _signed(command, sign, nicknames):
+    # '+a +b' in one join, rather than formatting each nickname and joining again
+    if not nicknames:
+        return utils.ircjoin(command)
+    
+    return utils.ircjoin(command, sign + (' ' + sign).join(nicknames))
+
+
 def cnotice(nickname, channel, message):
     
     return utils.ircjoin(constants.CNOTICE, nickname, channel, spaced=message)
@@ -426,6 +504,7 @@ def cprivmsg(nickname, channel, message):
     return utils.ircjoin(constants.CPRIVMSG, nickname, channel, spaced=message)
 
 
+@functools.lru_cache(maxsize=128)
 def help():
     
     return utils.ircjoin(constants.HELP)
@@ -436,11 +515,13 @@ def knock(channel, message=None):
     return utils.ircjoin(constants.KNOCK, channel, spaced=message)
 
 
+@functools.lru_cache(maxsize=128)
 def namesx():
     
     return utils.ircjoin(constants.NAMESX)
 
 
+@functools.lru_cache(maxsize=128)
 def rules():
     
     return utils.ircjoin(constants.RULES)
@@ -448,23 +529,23 @@ def rules():
 
 def setname(realname):
     
-    return utils.ircjoin(constants.SETNAME, spaced=realname)
+    if not realname:
+        return utils.ircjoin(constants.SETNAME)
+    
+    return _SETNAME % (realname, )
 
 
 def silence(*nicknames):
     # only adds nicknames to ignore list, see unsilence to remove
-    formatted = ['+{}'.format(nick) for nick in nicknames]
-    
-    return utils.ircjoin(constants.SILENCE, *formatted)
+    return _signed(constants.SILENCE, '+', nicknames)
 
 
 def unsilence(*nicknames):
     # only removes nicknames to ignore list, see silence to add
-    formatted = ['-{}'.format(nick) for nick in nicknames]
-    
-    return utils.ircjoin(constants.SILENCE, *formatted)
+    return _signed(constants.SILENCE, '-', nicknames)
 
 
+@functools.lru_cache(maxsize=128)
 def uhnames():
     
     return utils.ircjoin(constants.UHNAMES)
@@ -472,21 +553,17 @@ def uhnames():
 
 def userip(nickname):
     
-    return utils.ircjoin(constants.USERIP, nickname)
+    return _USERIP % (nickname, )
 
 
 def watch(*nicknames):
     # only adds nicknames to watch list, see unwatch to remove
-    formatted = ['+{}'.format(nick) for nick in nicknames]
-    
-    return utils.ircjoin(constants.WATCH, *formatted)
+    return _signed(constants.WATCH, '+', nicknames)
 
 
 def unwatch(*nicknames):
     # only removes nicknames to watch list, see watch to add
-    formatted = ['-{}'.format(nick) for nick in nicknames]
-    
-    return utils.ircjoin(constants.WATCH, *formatted)
+    return _signed(constants.WATCH, '-', nicknames)
 
 
 # convenience functions so users don't have to be intimate with IRC spec to run a bot
@@ -497,6 +574,13 @@ def identify(nickname, username, password=None):
     `user` in the correct order. This function returns one string containing three commands.
     """
     
-    lines = '' if password is None else pass_(password), nick(nickname), user(username)
+    lines = []
+    
+    # the password has to be set before registering
+    if password is not None:
+        lines.append(pass_(password))
+    
+    lines.append(nick(nickname))
+    lines.append(user(username))
 
     return ''.join(lines)
\ No newline at end of file
@@ -1,5 +1,12 @@
 import asyncio
-import abc
+import os
+
+try:
+    # optional, drop-in replacement for asyncio's event loop, see run_blocking
+    import uvloop
+    
+except ImportError:
+    uvloop = None
     
     
 class AsynchronousConnection:
@@ -8,60 +15,169 @@ class AsynchronousConnection:
         loop:
     """
     
+    __slots__ = ('_loop', 'reader', 'writer', '_pending', '_pending_size',
+                 '_flush_handle')
+    
+    # pending data past this many bytes is handed to the transport right away rather than
+    # at the next iteration, drain can only apply backpressure for data the transport has
+    flush_threshold = 2 ** 14
+    
+    # longest line run will accept from the server, same as asyncio's default stream limit
+    max_line_length = 2 ** 16
+    
     def __init__(self, *, loop=None):
-        self._loop = loop or asyncio.get_event_loop()
+        # looked up on first use, see loop
+        self._loop = loop
         
         self.reader, self.writer = None, None
         
+        # data written during the current loop iteration, not yet given to the transport
+        self._pending = []
+        self._pending_size = 0
+        # scheduled flush of the pending data, if any
+        self._flush_handle = None
+        
     
-    @abc.abstractmethod
     def handle_incoming(self, data):
-        """Called to handle each line of data sent by the server."""
-        pass
+        """Called to handle each line sent by the server, without its trailing newline."""
+        raise NotImplementedError
         
         
     @property
     def loop(self):
         """Read-only event loop."""
-        return self._loop
+        loop = self._loop
+        
+        if loop is None:
+            # not given one, so use the loop running when it's first needed
+            loop = self._loop = asyncio.get_running_loop()
+        
+        return loop
     
     
     @property
     def connected(self):
         """Read-only connection status."""
-        try:
-            # if reader or writer have received EOF then we've disconnected
-            return (not self.reader.at_eof()) and (not self.writer.is_closing())
+        reader, writer = self.reader, self.writer
         
-        except AttributeError:
-            # reader/writer haven't been set yet
+        # reader/writer haven't been set yet, or were cleared by disconnect
+        if reader is None or writer is None:
             return False
+        
+        # if reader or writer have received EOF then we've disconnected
+        return (not reader.at_eof()) and (not writer.is_closing())
     
     
     async def run(self, host, port, **kwargs):
         
+        if self._loop is None:
+            # cheaper than get_event_loop, and always the right loop inside a coroutine
+            self._loop = asyncio.get_running_loop()
+        
         await self.connect(host, port, **kwargs)
         
-        handle = self.handle_incoming
+        read, handle = self.reader.read, self.handle_incoming
+        limit = self.max_line_length
         
-        # iterate over lines as they're received, until EOF
-        async for line in self.reader:
-            handle(line)
+        # partial line left over from the previous read
+        buffer = b''
         
-        await self.disconnect()
+        try:
+            # take whatever the server has sent so far and split it into lines ourselves,
+            # so a burst of lines (e.g., MOTD or NAMES) costs one wake-up instead of one
+            # per line
+            while True:
+                data = await read(limit)
+                
+                if not data:
+                    break
+                
+                # split only what was just read rather than rescanning the leftover too
+                *lines, rest = data.split(b'\n')
+                
+                if lines:
+                    # only the first line continues the leftover from the previous read
+                    lines[0] = buffer + lines[0]
+                    buffer = rest
+                
+                else:
+                    buffer += rest
+                
+                # the other lines came from a single read, so can't be any longer than it,
+                # and bounding the leftover keeps a server without newlines from growing it
+                if len(buffer) > limit or (lines and len(lines[0]) > limit):
+                    raise ValueError('line exceeds {} bytes'.format(limit))
+                
+                for line in lines:
+                    handle(line)
+            
+            # EOF, but the server may have left us a final unterminated line
+            if buffer:
+                handle(buffer)
+        
+        finally:
+            # also close the connection if reading failed or the run was cancelled, unless
+            # a plugin has already disconnected, which is what ended the reads
+            if self.writer is not None:
+                await self.disconnect()
         
     
-    def run_blocking(self, host, port, **kwargs):
-    
+    def run_blocking(self, host, port, *, use_uvloop=None, **kwargs):
+        """
+        Run the connection until it is closed.
+        
+        Runs on the loop given to the connection, if any. Otherwise a new event loop is
+        created, set as the current loop for the duration of the run, and closed
+        afterwards. The new loop comes from uvloop if it's installed, unless `use_uvloop`
+        is False (or, if it's not given, the CHITCHAT_NO_UVLOOP environment variable is
+        set). The global event loop policy is left alone either way.
+        """
+        loop = self._loop
         coro = self.run(host, port, **kwargs)
-        self.loop.run_until_complete(coro)
+        
+        if loop is not None:
+            # someone else's loop, which may be running other code's tasks too, so leave
+            # its task factory alone
+            loop.run_until_complete(coro)
+            return
+        
+        if use_uvloop is None:
+            use_uvloop = not os.environ.get('CHITCHAT_NO_UVLOOP')
+        
+        if use_uvloop and uvloop is not None:
+            loop = uvloop.new_event_loop()
+        
+        else:
+            loop = asyncio.new_event_loop()
+        
+        # eager tasks run synchronously until their first suspension, so handlers that
+        # never await finish without a trip through the scheduler (Python 3.12+); only
+        # done on our own loop, as it changes when every task on the loop runs
+        factory = getattr(asyncio, 'eager_task_factory', None)
+        
+        if factory is not None:
+            loop.set_task_factory(factory)
+        
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        
+        try:
+            loop.run_until_complete(coro)
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        
+        finally:
+            # the loop is ours, don't leave it behind for a later run (or anyone else)
+            asyncio.set_event_loop(None)
+            loop.close()
+            self._loop = None
 
     
     async def connect(self, host, port, **kwargs):
         """
         Open a connection to `host`.
         """        
-        streams = await asyncio.open_connection(host, port, loop=self.loop, **kwargs)
+        # open_connection always uses the running loop, it no longer takes loop= (3.10+)
+        streams = await asyncio.open_connection(host, port, **kwargs)
         
         self.reader, self.writer = streams
         
@@ -72,6 +188,9 @@ class AsynchronousConnection:
         """
         Close the connection with the host.
         """
+        # don't lose anything written just before disconnecting, e.g., a QUIT
+        self._flush()
+        
         self.close_streams()
         self.reader, self.writer = None, None
         
@@ -98,7 +217,7 @@ class AsynchronousConnection:
         """
         # default of None is more Pythonic than -1
         n = -1 if n is None or n < 0 else n
-        return self.reader.read(n)
+        return await self.reader.read(n)
     
     
     async def readline(self):
@@ -113,7 +232,7 @@ class AsynchronousConnection:
         
         This method is a coroutine.
         """
-        return self.reader.readline()
+        return await self.reader.readline()
     
     
     async def readexactly(self, n):
@@ -126,26 +245,66 @@ class AsynchronousConnection:
         
         This method is a coroutine.
         """
-        return self.reader.readexactly(n)
+        return await self.reader.readexactly(n)
     
     
     async def write(self, data):
         """
-        Write some data bytes to the transport and flush the buffer.
+        Queue some data bytes to be written to the transport, and wait for it to drain.
+        
+        Writes made during the same iteration of the event loop are handed to the
+        transport together at its next iteration, or sooner once `flush_threshold` bytes
+        are pending, see `writelines`.
         
         This method is a coroutine.
         """
-        writer = self.writer
-        writer.write(data)
-        await writer.drain()
+        self._buffer((data, ))
+        await self.writer.drain()
         
         
     async def writelines(self, data):
         """
-        Write an iterable of data bytes to the transport and flush the buffer.
+        Queue an iterable of data bytes to be written to the transport, and wait for it
+        to drain.
+        
+        Rather than being written immediately, data is collected until the event loop's
+        next iteration and then handed to the transport in one call, so that several
+        plugins replying to the same message share a single send.
         
         This method is a coroutine.
         """
-        writer = self.writer
-        writer.writelines(data)
-        await writer.drain()
\ No newline at end of file
+        self._buffer(data)
+        await self.writer.drain()
+        
+        
+    def _buffer(self, data):
+        """Collect `data` to be written at the event loop's next iteration."""
+        pending = self._pending
+        start = len(pending)
+        
+        if not start:
+            # first write since the last flush, schedule one for everything that follows
+            self._flush_handle = self.loop.call_soon(self._flush)
+        
+        pending.extend(data)
+        self._pending_size += sum(map(len, pending[start:]))
+        
+        if self._pending_size >= self.flush_threshold:
+            # a writer that keeps writing without ever yielding would otherwise pile
+            # everything up in _pending while drain sees an empty transport
+            self._flush()
+        
+        
+    def _flush(self):
+        """Hand all collected data to the transport."""
+        pending, self._pending = self._pending, []
+        self._pending_size = 0
+        
+        # flushed early (or on disconnect), the scheduled flush has nothing left to do
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        # the connection may have been closed since the flush was scheduled
+        if pending and self.writer is not None:
+            self.writer.writelines(pending)
\ No newline at end of file
@@ -1,9 +1,27 @@
-import asyncio
 import collections
+import functools
+import inspect
+import sys
 
 from . import utils
 
 
+def _wrap_async(func):
+    """Wrap a regular function so that calling it returns a native coroutine."""
+    
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        
+        # e.g., `lambda client, message: client.send(...)`, run what it hands back too
+        if inspect.isawaitable(result):
+            result = await result
+        
+        return result
+    
+    return wrapper
+
+
 class Plugin:
     
     
@@ -19,12 +37,28 @@ class Plugin:
     
     @func.setter
     def func(self, value):
-        self._func = asyncio.coroutine(value)
+        self._func = value
+        # checked once here rather than every time the plugin is triggered; inspect
+        # reads the CO_COROUTINE code flag directly, asyncio's version (deprecated in
+        # Python 3.14) also looks for legacy generator-coroutine markers
+        self.asynchronous = inspect.iscoroutinefunction(value)
+        self._coroutine = value if self.asynchronous else _wrap_async(value)
+    
+    
+    @property
+    def command(self):
+        return self._command
+    
+    
+    @command.setter
+    def command(self, value):
+        # normalized once here so clients can use it as a dispatch key as is
+        self._command = sys.intern(value.upper())
     
         
-    async def __call__(self, *args, **kwargs):            
-        val = await self.func(*args, **kwargs)
-        return val
+    def __call__(self, *args, **kwargs):
+        # hand back the plugin's own coroutine rather than awaiting it inside another
+        return self._coroutine(*args, **kwargs)
     
     
     def __repr__(self):
@@ -32,25 +66,68 @@ class Plugin:
         return r.format(self)
 
 
-class Message(str):
+# marks a cached attribute that hasn't been computed yet, where None is a valid value
+_unset = object()
+
+
+class Message:
+    """
+    A line received from the server.
+    
+    Messages hold on to the undecoded bytes they were created with; decoding and parsing
+    are deferred until an attribute that needs them is first accessed, so messages that
+    no plugin ever looks at cost next to nothing.
+    
+    args:
+        data: bytes representing a single line received from the server
+        encoding: str name of the encoding used to decode `data`, defaults to UTF-8
+    """
+    
+    # lots of these are created, slots keep them small; lazily computed attributes are
+    # cached in the underscored slots, which are None until first accessed
+    __slots__ = ('data', 'encoding', '_raw', '_parsed', '_parsed_prefix', '_command',
+                 '_channel')
+    
+    def __init__(self, data, encoding='UTF-8'):
+        self.data = data
+        self.encoding = encoding
+        
+        self._raw = self._parsed = self._parsed_prefix = self._command = None
+        self._channel = _unset
     
     
     @property
     def raw(self):
-        """Underlying string message from the server. Alias for `str(self)`."""
-        return str(self)
+        """Underlying string message from the server, without the trailing line ending."""
+        raw = self._raw
+        
+        if raw is None:
+            # stripping the undecoded bytes only looks at the last few bytes of the line
+            raw = self._raw = self.data.rstrip(b'\r\n').decode(self.encoding)
+        
+        return raw
 
 
-    @utils.lazyproperty
+    @property
     def parsed(self):
         """Message parsed into component prefix, command, and params."""
-        return utils.ircparse(self)
+        parsed = self._parsed
+        
+        if parsed is None:
+            parsed = self._parsed = utils.ircparse(self.raw)
+        
+        return parsed
     
     
-    @utils.lazyproperty
+    @property
     def parsed_prefix(self):
         """Prefix of the message sender parsed into component nick, user, and host."""
-        return utils.prefixsplit(self.prefix)
+        parsed_prefix = self._parsed_prefix
+        
+        if parsed_prefix is None:
+            parsed_prefix = self._parsed_prefix = utils.prefixsplit(self.prefix)
+        
+        return parsed_prefix
     
     
     @property
@@ -61,8 +138,15 @@ class Message(str):
     
     @property
     def command(self):
-        """Message command or numeric reply. Alias for `self.parsed.command`."""
-        return self.parsed.command
+        """Upper-cased message command or numeric reply."""
+        command = self._command
+        
+        if command is None:
+            # read straight from the undecoded line so dispatch never forces a full parse
+            command = utils.ircpeek(self.data).upper().decode(self.encoding)
+            self._command = command
+        
+        return command
     
     
     @property
@@ -104,8 +188,16 @@ class Message(str):
     @property
     def channel(self):
         """Message target channel, or None if target is not a channel."""
-        target = self.target
-        return target if target and utils.ischannel(target) else None
+        channel = self._channel
+        
+        # cached, reply_to checks this for every reply a plugin makes; None is a valid
+        # result here, so an unset channel is marked differently
+        if channel is _unset:
+            target = self.target
+            channel = target if target and utils.ischannel(target) else None
+            self._channel = channel
+        
+        return channel
     
     
     def reply_to(self, public=True):
@@ -128,8 +220,12 @@ class Message(str):
         return self.nick or self.host
     
     
+    def __str__(self):
+        return self.raw
+    
+    
     def __repr__(self):
-        r = '{0.__class__.__name__}({0.raw!r})'
+        r = '{0.__class__.__name__}({0.data!r})'
         return r.format(self)
     
     
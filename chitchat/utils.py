@@ -1,5 +1,4 @@
 import collections
-import inspect
 import sys
 
 from . import constants
@@ -19,15 +18,14 @@ def ircjoin(*args, spaced=None):
         A string representing the formatted message.
     """
     
-    # waiting for f-strings
-    format_list = ['{}'] * len(args)
+    # str.format has to parse a freshly built format string on every call, joining the
+    # already-stringified params skips that
+    params = [str(arg) for arg in args]
     
     if spaced:
-        format_list.append(':{}')
+        params.append(':' + str(spaced))
     
-    line = ' '.join(format_list)
-    
-    return line.format(*args, spaced) + constants.CRLF
+    return ' '.join(params) + constants.CRLF
 
 
 Message = collections.namedtuple('Message', ['prefix', 'command', 'params'])
@@ -55,37 +53,63 @@ def ircparse(message):
     # strip off trailing carriage returns ('\r') and newlines ('\n')
     message = message.rstrip(constants.CRLF)
     
-    try:
-        # last arg is separated by ' :' and may contain spaces itself
-        leading, spaced = message.rsplit(' :', maxsplit=1)
+    # last arg is separated by the first ' :' and may contain spaces, or even ' :', itself
+    index = message.find(' :')
     
-    except ValueError:
+    if index < 0:
         leading, spaced = message, None
-    
-    try:
-        # all remaining args are space-delimited
-        first, *remaining = leading.split()
         
-    except ValueError:
-        # leading is empty or is all whitespace, so this message has no other args
-        first, remaining = '', ()
+    else:
+        leading, spaced = message[:index], message[index + 2:]
     
-    if first.startswith(':'):
-        # leading colon signifies presence of (non-empty) prefix
-        prefix = first[1:]
-        # command must be second arg, or non-existent if remaining is empty
-        command, *remaining = remaining or ('', )
+    # all remaining args are space-delimited
+    args = leading.split()
     
+    # leading colon signifies presence of (non-empty) prefix
+    if args and args[0].startswith(':'):
+        prefix, start = args[0][1:], 1
+        
     else:
-        # no prefix means leading arg is command
-        prefix, command = '', first
+        prefix, start = '', 0
+    
+    # command must follow the prefix, or is non-existent if there are no args left
+    command = args[start] if len(args) > start else ''
+    
+    # slice the rest straight out of the split rather than unpacking it arg by arg
+    params = args[start + 1:]
+    
+    if spaced is not None:
+        params.append(spaced)
     
-    # concatenate remaining args, if any, into tuple
-    params = tuple(remaining) if spaced is None else (*remaining, spaced)
+    params = tuple(params)
     
     return Message(prefix, command, params)
 
 
+def ircpeek(line):
+    """
+    Extract the command from a raw IRC message without parsing the rest of it.
+    
+    This is a cheap alternative to `ircparse` for when only the command is needed, e.g.,
+    to decide whether a message is worth parsing at all. The command is returned as is,
+    it is not decoded or case-normalized.
+    
+    args:
+        line: A bytes object representing the IRC message to peek at.
+        
+    returns:
+        A bytes object representing the command, which may be empty.
+    """
+    
+    if line.startswith(b':'):
+        # skip past the prefix, the command follows the first space
+        _, _, line = line.partition(b' ')
+    
+    command, _, _ = line.lstrip(b' ').partition(b' ')
+    
+    return command.rstrip(b'\r\n')
+
+
 Prefix = collections.namedtuple('Prefix', ['nick', 'user', 'host'])
 
 
@@ -103,16 +127,16 @@ def prefixsplit(prefix):
     if not prefix:
         return Prefix(nick='', user='', host='')
     
-    try:
-        nick, prefix = prefix.split('!', maxsplit=1)
+    # partition rather than split and catch ValueError, server prefixes have neither
+    # delimiter and raising is far more expensive than a failed partition
+    nick, sep, prefix = prefix.partition('!')
     
-    except ValueError:
-        nick = ''
+    if not sep:
+        nick, prefix = '', nick
         
-    try:
-        user, host = prefix.split('@', maxsplit=1)
+    user, sep, host = prefix.partition('@')
     
-    except ValueError:
+    if not sep:
         # probably from the host server
         user = ''
         host = prefix if not nick else ''
@@ -177,27 +201,13 @@ def find_plugins(object=None):
         # don't return early as `object` may have plugins as members
         # unlikely, but we'll check anyway on the off chance
     
-    for name, value in inspect.getmembers(object, isplugin):
-        yield value
-
-
-class lazyproperty:
-    """
-    Code modified from:
-    http://stackoverflow.com/questions/3012421/python-lazy-property-decorator/6849299#6849299
-    """
-    
-    def __init__(self, fget):
-        self.fget = fget
-        self.attr_name = fget.__name__
-        
-        
-    def __get__(self, instance, owner=None):
-        if instance is None:
-            return self
-        
-        value = self.fget(instance)
-        # replace the property with the returned value
-        setattr(instance, self.attr_name, value)
+    # unlike inspect.getmembers, don't build and sort a list of every member up front
+    for name in dir(object):
+        try:
+            value = getattr(object, name)
+            
+        except AttributeError:
+            continue
         
-        return value
\ No newline at end of file
+        if isplugin(value):
+            yield value
@@ -8,6 +8,9 @@ setup(
     keywords='irc async asynchronous asyncio bot',
     url='https://github.com/necromanteion/chitchat',
     packages=['chitchat', 'tests'],
+    extras_require={
+        'uvloop': ['uvloop'],
+    },
     classifiers=[
         'Development Status :: 1 - Planning',
         'Programming Language :: Python :: 3.5',
@@ -0,0 +1,63 @@
+import asyncio
+
+from chitchat import Client, structures
+
+
+async def dispatch():
+    client = Client()
+    seen = []
+    
+    # registered in lower case, dispatched on the upper-cased, undecoded command
+    client.on('privmsg', lambda client, message: seen.append(('privmsg', message.command)))
+    
+    client.handle_incoming(b':sakubot!v3@bot.made.of.socks privmsg #chitchat :hi')
+    client.handle_incoming(b'PING :irc.rizon.net')
+    
+    # PING has no plugins of its own, so nothing else is triggered
+    assert seen == [('privmsg', 'PRIVMSG')]
+    
+    # ALL plugins are triggered for commands with plugins of their own and without
+    async def everything(client, message):
+        seen.append(('all', message.command))
+    
+    client.on('ALL', everything)
+    seen.clear()
+    
+    client.handle_incoming(b':sakubot!v3@bot.made.of.socks PRIVMSG #chitchat :hi')
+    client.handle_incoming(b'PING :irc.rizon.net')
+    
+    # let the ALL coroutines run
+    await asyncio.sleep(0)
+    
+    assert sorted(seen) == [('all', 'PING'), ('all', 'PRIVMSG'), ('privmsg', 'PRIVMSG')]
+    
+    # trigger takes str commands in any case, which are encoded for the lookup
+    seen.clear()
+    client.trigger('privmsg', structures.Message(b'PRIVMSG #chitchat :hi'))
+    await asyncio.sleep(0)
+    
+    assert sorted(seen) == [('all', 'PRIVMSG'), ('privmsg', 'PRIVMSG')]
+
+
+async def returns_coroutine():
+    client = Client()
+    seen = []
+    
+    async def reply(message):
+        seen.append(message.command)
+    
+    # a regular function, but what it returns still has to run
+    plugin = client.on('privmsg', lambda client, message: reply(message))
+    message = structures.Message(b'PRIVMSG #chitchat :hi')
+    
+    await plugin(client, message)
+    assert seen == ['PRIVMSG']
+    
+    seen.clear()
+    client.handle_incoming(b'PRIVMSG #chitchat :hi')
+    await asyncio.sleep(0)
+    
+    assert seen == ['PRIVMSG']
+
+asyncio.run(dispatch())
+asyncio.run(returns_coroutine())
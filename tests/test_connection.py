@@ -0,0 +1,89 @@
+import asyncio
+
+from chitchat import Client
+
+
+async def backpressure():
+    # a server that accepts connections but never reads from them
+    peers = []
+    server = await asyncio.start_server(lambda reader, writer: peers.append(writer),
+                                        '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    
+    client = Client()
+    await client.connect('127.0.0.1', port)
+    
+    async def flood():
+        for _ in range(200000):
+            await client.send(b'x' * 398 + b'\r\n')
+    
+    task = asyncio.ensure_future(flood())
+    await asyncio.sleep(0.5)
+    
+    # send is stuck in drain, with the data handed to the transport instead of pending
+    assert not task.done()
+    assert client._pending_size < client.flush_threshold
+    
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    client.writer.transport.abort()
+    server.close()
+
+
+async def overlong():
+    # a server that never ends its line
+    async def serve(reader, writer):
+        writer.write(b'x' * (Client.max_line_length + 1))
+        await writer.drain()
+    
+    server = await asyncio.start_server(serve, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    
+    client = Client()
+    
+    try:
+        await client.run('127.0.0.1', port)
+    
+    except ValueError:
+        pass
+    
+    else:
+        raise AssertionError('run accepted a line longer than max_line_length')
+    
+    # run gave up on the line and closed the connection
+    assert client.writer is None
+    server.close()
+
+
+async def splitting():
+    # lines split across writes, several lines in one write, and an unterminated last line
+    chunks = [b'PING :irc.ri', b'zon.net\r\n:sakubot!v3@bot.made.of.socks PRIVMSG #chitchat',
+              b' :hi\r\nPING :a\r\nPING :b\nQUIT :bye']
+    
+    async def serve(reader, writer):
+        for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        
+        writer.close()
+    
+    server = await asyncio.start_server(serve, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    
+    client = Client()
+    lines = []
+    client.on('ALL', lambda client, message: lines.append(message.data))
+    
+    await client.run('127.0.0.1', port)
+    
+    # only the newline is split on, Message strips the carriage return
+    assert lines == [b'PING :irc.rizon.net\r',
+                     b':sakubot!v3@bot.made.of.socks PRIVMSG #chitchat :hi\r',
+                     b'PING :a\r', b'PING :b', b'QUIT :bye']
+    server.close()
+
+
+asyncio.run(backpressure())
+asyncio.run(splitting())
+asyncio.run(overlong())
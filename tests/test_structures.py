@@ -4,4 +4,32 @@ d = structures.CaseInsensitiveDefaultDict.fromkeys(list, range(15))
 
 print(d)
 
-print(d['this'])
\ No newline at end of file
+print(d['this'])
+
+# messages keep the undecoded line and decode it lazily, without the line ending
+m = structures.Message(b':sakubot!v3@bot.made.of.socks privmsg #chitchat :hi :) there\r\n')
+
+print(repr(m), m.raw, m.command, m.channel)
+
+assert m.data.endswith(b'\r\n')
+assert m.raw == ':sakubot!v3@bot.made.of.socks privmsg #chitchat :hi :) there'
+assert m.command == 'PRIVMSG'
+assert m.params == ('#chitchat', 'hi :) there')
+assert m.channel == '#chitchat'
+assert m.nick == 'sakubot'
+
+# computed once, then cached
+assert m.raw is m.raw
+assert m.parsed is m.parsed
+
+# not being in a channel is cached too
+m = structures.Message(b'PRIVMSG sakubot :hello\n')
+
+assert m.raw == 'PRIVMSG sakubot :hello'
+assert m.channel is None
+assert m._channel is None
+
+m = structures.Message(b'PING :irc.rizon.net')
+
+assert m.command == 'PING'
+assert m.params == ('irc.rizon.net', )
@@ -9,3 +9,10 @@ print(utils.prefixsplit(server))
 print(utils.prefixsplit(p))
 print(utils.prefixsplit(nohost))
 print(utils.prefixsplit(nouser))
+
+print(utils.ircpeek(b':sakubot!v3@bot.made.of.socks PRIVMSG #chitchat :hello there\r\n'))
+print(utils.ircpeek(b'PING :irc.rizon.net\r\n'))
+print(utils.ircpeek(b'QUIT\r\n'))
+
+print(utils.ircparse(':sakubot!v3@bot.made.of.socks PRIVMSG #chitchat :hi :) there\r\n'))
+print(utils.ircparse('PING :irc.rizon.net\r\n'))